@@ -13,12 +13,15 @@ from .dependency import (
     load_locked_dependencies,
     load_dependencies,
 )
-from .deps import install_dependency
+from .deps import install_dependency, sync_dependency
+from .watch import watch_dependencies
 
 
 @dataclass
 class TypedObj:
     config_dir: str
+    dependencies_path: str
+    dependencies_lock_path: str
     dependencies: OrderedDict[str, Dependency]
     locked_dependencies: OrderedDict[str, LockedDependency]
 
@@ -55,6 +58,8 @@ def cli(ctx: click.Context, config_dir: str) -> None:
 
     ctx.obj = TypedObj(
         config_dir=config_dir,
+        dependencies_path=dependencies_path,
+        dependencies_lock_path=dependencies_lock_path,
         dependencies=dependencies,
         locked_dependencies=locked_dependencies,
         write_dependencies=write_dependencies_,
@@ -119,15 +124,10 @@ def install(obj: TypedObj, force: bool, write_lovelace_resources: bool) -> None:
     should_write_locked_dependencies = False
 
     for dependency in obj.dependencies.values():
-        lock_info = obj.locked_dependencies.get(dependency.source)
-        updated_lock_info = install_dependency(
-            obj.config_dir, dependency, lock_info, force=force
-        )
-
-        if lock_info is None:
-            # Only update locked dependency if no lock was previously specified
+        if sync_dependency(
+            obj.config_dir, dependency, obj.locked_dependencies, force=force
+        ):
             should_write_locked_dependencies = True
-            obj.locked_dependencies[dependency.source] = updated_lock_info
 
     if should_write_locked_dependencies:
         obj.write_locked_dependencies()
@@ -154,5 +154,21 @@ def upgrade(obj: TypedObj, dependencies: List[str]) -> None:
     obj.write_locked_dependencies()
 
 
+@cli.command(
+    help="Watch hass-deps.yaml and hass-deps.lock, installing dependencies as they change"
+)
+@click.pass_obj
+@click.option(
+    "--interval",
+    help="Seconds between checks for changes",
+    type=click.FloatRange(min=0.1),
+    default=1.0,
+)
+def watch(obj: TypedObj, interval: float) -> None:
+    watch_dependencies(
+        obj.config_dir, obj.dependencies_path, obj.dependencies_lock_path, interval
+    )
+
+
 if __name__ == "__main__":
     cli()
@@ -48,6 +48,12 @@ class LockedDependency(NamedTuple):
     # List of installed core components from this dependency
     # (only applicable when type is core)
     components: Optional[List[str]]
+    # Full commit SHA the dependency was installed from
+    # (only applicable when not a release)
+    commit: Optional[str] = None
+    # Digests of downloaded release assets, keyed by asset name
+    # (only applicable when is_release)
+    asset_digests: Optional[Dict[str, str]] = None
 
     def get_name(self) -> str:
         name, _ = splitext(basename(urlparse(self.source).path))
@@ -111,6 +117,8 @@ def load_locked_dependencies(path: str) -> OrderedDict[str, LockedDependency]:
                 is_release=data.get("is_release", False),
                 type=data["type"],
                 components=data.get("components"),
+                commit=data.get("commit"),
+                asset_digests=data.get("asset_digests"),
             )
     return dependencies
 
@@ -118,25 +126,32 @@ def load_locked_dependencies(path: str) -> OrderedDict[str, LockedDependency]:
 def write_locked_dependencies(
     path: str, locked_dependencies: OrderedDict[str, LockedDependency]
 ) -> None:
-    dumpable: Dict[str, Dict[str, Union[str, bool, List[str]]]] = {}
+    dumpable: Dict[str, Dict[str, Union[str, bool, List[str], Dict[str, str]]]] = {}
     for source, lock_info in locked_dependencies.items():
         dumpable[source] = {
             "version": lock_info.version,
             "type": lock_info.type,
         }
 
+        if lock_info.commit is not None:
+            dumpable[source]["commit"] = lock_info.commit
+
         if lock_info.is_release:
             dumpable[source]["is_release"] = True
 
         if lock_info.components is not None:
             dumpable[source]["components"] = lock_info.components
 
+        if lock_info.asset_digests is not None:
+            dumpable[source]["asset_digests"] = lock_info.asset_digests
+
     with open(path, "w") as f:
         yaml.dump(dumpable, f)
 
 
 class PackageInfo(NamedTuple):
     version: str
+    commit: Optional[str] = None
 
 
 def load_package_info(package_dir: str) -> Optional[PackageInfo]:
@@ -146,9 +161,13 @@ def load_package_info(package_dir: str) -> Optional[PackageInfo]:
 
     with open(package_info_path) as f:
         data = json.load(f)
-        return PackageInfo(version=data["version"])
+        return PackageInfo(version=data["version"], commit=data.get("commit"))
 
 
 def write_package_info(package_dir: str, info: PackageInfo) -> None:
+    data = {"version": info.version}
+    if info.commit is not None:
+        data["commit"] = info.commit
+
     with open(os.path.join(package_dir, ".hass-deps"), "w") as f:
-        json.dump({"version": info.version}, f)
+        json.dump(data, f)
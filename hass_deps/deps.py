@@ -1,8 +1,9 @@
+from collections import OrderedDict
 from typing import Optional
 
 import click
 
-from .dependency import Dependency, LockedDependency, load_package_info
+from .dependency import Dependency, LockedDependency, PackageInfo, load_package_info
 from .deps_core import (
     install_core_dependency,
     is_core_dependency,
@@ -12,8 +13,22 @@ from .deps_lovelace import (
     install_lovelace_release_dependency,
     install_lovelace_dependency,
     get_lovelace_destination_path,
+    is_lovelace_release_installed,
 )
-from .source import checkout_dependency_source
+from .exceptions import SourceCommitMismatchException
+from .source import checkout_dependency_source, get_source_commit
+
+
+def is_package_up_to_date(
+    package_info: Optional[PackageInfo], lock_info: LockedDependency
+) -> bool:
+    if package_info is None:
+        return False
+
+    if lock_info.commit is not None:
+        return package_info.commit == lock_info.commit
+
+    return package_info.version == lock_info.version
 
 
 def install_dependency(
@@ -30,7 +45,12 @@ def install_dependency(
                 config_root_path, lock_info.get_name()
             )
             package_info = load_package_info(installed_path)
-            if package_info is not None and package_info.version == lock_info.version:
+            if is_package_up_to_date(package_info, lock_info) and (
+                lock_info.asset_digests is None
+                or is_lovelace_release_installed(
+                    installed_path, lock_info.asset_digests
+                )
+            ):
                 click.echo(
                     f"{dependency.get_name()}@{lock_info.version} already installed"
                 )
@@ -43,7 +63,7 @@ def install_dependency(
             for component in lock_info.components:
                 installed_path = get_core_destination_path(config_root_path, component)
                 package_info = load_package_info(installed_path)
-                if package_info is None or package_info.version != lock_info.version:
+                if not is_package_up_to_date(package_info, lock_info):
                     # Installed version != locked version, reinstall.
                     break
             else:  # nobreak
@@ -57,22 +77,95 @@ def install_dependency(
     if lock_info is not None and lock_info.type == "lovelace" and lock_info.is_release:
         # Install directly from Github Releases, skip inference logic.
         rv = install_lovelace_release_dependency(
-            config_root_path, dependency, tag_name=lock_info.version
+            config_root_path,
+            dependency,
+            tag_name=lock_info.version,
+            asset_digests=lock_info.asset_digests,
         )
     else:
         version_ref = lock_info.version if lock_info else None
-        with checkout_dependency_source(dependency, version_ref) as source_path:
+        commit = lock_info.commit if lock_info else None
+        with checkout_dependency_source(
+            dependency, version_ref, commit=commit
+        ) as source_path:
+            # Keep the locked version once the checkout is verified to be the
+            # locked commit, as it may be too shallow for `git describe` to
+            # reproduce it.
+            locked_version = None
+            if commit is not None:
+                checked_out_commit = get_source_commit(source_path)
+                if checked_out_commit != commit:
+                    raise SourceCommitMismatchException(
+                        f"Checked out {checked_out_commit} for "
+                        f"{dependency.get_name()}, expected locked commit {commit}"
+                    )
+                locked_version = version_ref
+
             is_core = (
                 lock_info.type == "core"
                 if lock_info
                 else is_core_dependency(dependency, source_path)
             )
             if is_core:
-                rv = install_core_dependency(config_root_path, dependency, source_path)
+                rv = install_core_dependency(
+                    config_root_path, dependency, source_path, version=locked_version
+                )
             else:
                 rv = install_lovelace_dependency(
-                    config_root_path, dependency, source_path
+                    config_root_path, dependency, source_path, version=locked_version
                 )
 
     click.echo(f"Installed {dependency.get_name()}@{rv.version}")
     return rv
+
+
+def get_updated_lock_info(
+    lock_info: LockedDependency, resolved_lock_info: LockedDependency
+) -> Optional[LockedDependency]:
+    """Update a lock entry with details resolved from installing it.
+
+    Fills in missing pins and refreshes the installed components. Returns None if
+    the resolved version differs or there is nothing to update.
+    """
+    if resolved_lock_info.version != lock_info.version:
+        return None
+
+    updated_lock_info = lock_info._replace(
+        commit=lock_info.commit or resolved_lock_info.commit,
+        asset_digests=lock_info.asset_digests or resolved_lock_info.asset_digests,
+        components=resolved_lock_info.components,
+    )
+    if updated_lock_info == lock_info:
+        return None
+
+    return updated_lock_info
+
+
+def sync_dependency(
+    config_root_path: str,
+    dependency: Dependency,
+    locked_dependencies: OrderedDict[str, LockedDependency],
+    force: bool = False,
+) -> bool:
+    """Install a dependency at its locked version, locking it if not yet locked.
+
+    Returns whether `locked_dependencies` was updated.
+    """
+    lock_info = locked_dependencies.get(dependency.source)
+    resolved_lock_info = install_dependency(
+        config_root_path, dependency, lock_info, force=force
+    )
+
+    if lock_info is None:
+        # Only update locked dependency if no lock was previously specified
+        locked_dependencies[dependency.source] = resolved_lock_info
+        return True
+
+    # Record the commit/asset digests of legacy lock entries, and components
+    # changed by a reinstall with new config.
+    updated_lock_info = get_updated_lock_info(lock_info, resolved_lock_info)
+    if updated_lock_info is not None:
+        locked_dependencies[dependency.source] = updated_lock_info
+        return True
+
+    return False
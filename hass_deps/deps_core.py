@@ -1,10 +1,10 @@
-import json
 import os
 import shutil
-import subprocess
+from typing import Optional
 
-from .dependency import Dependency, LockedDependency
+from .dependency import Dependency, LockedDependency, PackageInfo, write_package_info
 from .exceptions import ArtifactNotFoundException
+from .source import get_source_commit, get_source_version
 
 
 def is_core_dependency(dependency: Dependency, cloned_path: str) -> bool:
@@ -20,7 +20,10 @@ def get_core_destination_path(config_root_path: str, name: str) -> str:
 
 
 def install_core_dependency(
-    config_root_path: str, dependency: Dependency, cloned_path: str
+    config_root_path: str,
+    dependency: Dependency,
+    cloned_path: str,
+    version: Optional[str] = None,
 ) -> LockedDependency:
     custom_components_path = os.path.join(cloned_path, "custom_components")
     if dependency.root_is_custom_components:
@@ -33,10 +36,9 @@ def install_core_dependency(
     if not os.path.exists(custom_components_root_path):
         os.mkdir(custom_components_root_path)
 
-    describe_result = subprocess.run(
-        ["git", "describe", "--always"], cwd=cloned_path, stdout=subprocess.PIPE
-    )
-    version = describe_result.stdout.decode("utf-8").strip()
+    if version is None:
+        version = get_source_version(cloned_path)
+    commit = get_source_commit(cloned_path)
 
     installed_components = []
     for component in os.listdir(custom_components_path):
@@ -54,8 +56,9 @@ def install_core_dependency(
         shutil.copytree(component_path, destination_path)
         installed_components.append(component)
 
-        with open(os.path.join(destination_path, ".hass-deps"), "w") as f:
-            json.dump({"version": version}, f)
+        write_package_info(
+            destination_path, PackageInfo(version=version, commit=commit)
+        )
 
     return LockedDependency(
         source=dependency.source,
@@ -63,4 +66,5 @@ def install_core_dependency(
         is_release=False,
         type="core",
         components=installed_components,
+        commit=commit,
     )
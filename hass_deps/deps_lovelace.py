@@ -1,15 +1,15 @@
+import hashlib
 import json
 import os
 import shutil
-import subprocess
 from typing import Optional, Dict, Any, cast, List
 from urllib.parse import urlparse
 
 import requests
 
 from .dependency import Dependency, LockedDependency, PackageInfo, write_package_info
-from .exceptions import ArtifactNotFoundException
-from .source import find_source_artifacts
+from .exceptions import ArtifactNotFoundException, ArtifactDigestMismatchException
+from .source import find_source_artifacts, get_source_commit, get_source_version
 
 
 def get_github_release(
@@ -40,12 +40,34 @@ def find_github_releases_artifacts(
     return artifacts
 
 
+def get_content_digest(content: bytes) -> str:
+    return "sha256:" + hashlib.sha256(content).hexdigest()
+
+
 def get_lovelace_destination_path(config_root_path: str, name: str) -> str:
     return os.path.join(config_root_path, "www/community", name)
 
 
+def is_lovelace_release_installed(
+    installed_path: str, asset_digests: Dict[str, str]
+) -> bool:
+    for name, digest in asset_digests.items():
+        asset_path = os.path.join(installed_path, name)
+        if not os.path.exists(asset_path):
+            return False
+
+        with open(asset_path, "rb") as f:
+            if get_content_digest(f.read()) != digest:
+                return False
+
+    return True
+
+
 def install_lovelace_release_dependency(
-    config_root_path: str, dependency: Dependency, tag_name: Optional[str]
+    config_root_path: str,
+    dependency: Dependency,
+    tag_name: Optional[str],
+    asset_digests: Optional[Dict[str, str]] = None,
 ) -> LockedDependency:
     release_data = get_github_release(dependency, tag_name=tag_name)
     if release_data is None:
@@ -53,6 +75,23 @@ def install_lovelace_release_dependency(
 
     github_artifacts = find_github_releases_artifacts(dependency, release_data)
     if len(github_artifacts):
+        # Download and verify all assets before replacing the existing install.
+        artifact_contents = {}
+        for artifact in github_artifacts:
+            resp = requests.get(artifact)
+            resp.raise_for_status()
+            artifact_contents[os.path.basename(urlparse(artifact).path)] = resp.content
+
+        installed_asset_digests = {
+            name: get_content_digest(content)
+            for name, content in artifact_contents.items()
+        }
+        if asset_digests is not None and installed_asset_digests != asset_digests:
+            raise ArtifactDigestMismatchException(
+                f"Release assets for {dependency.get_name()}@{release_data['tag_name']}"
+                " do not match the locked asset digests"
+            )
+
         destination_path = get_lovelace_destination_path(
             config_root_path, dependency.get_name()
         )
@@ -60,15 +99,12 @@ def install_lovelace_release_dependency(
             shutil.rmtree(destination_path)
         os.makedirs(destination_path, exist_ok=True)
 
-        for artifact in github_artifacts:
-            artifact_basename = os.path.basename(urlparse(artifact).path)
+        for artifact_basename, content in artifact_contents.items():
             artifact_destination_path = os.path.join(
                 destination_path, artifact_basename
             )
-            resp = requests.get(artifact)
-            resp.raise_for_status()
             with open(artifact_destination_path, "wb") as f:
-                f.write(resp.content)
+                f.write(content)
 
         version = release_data["tag_name"]
         write_package_info(destination_path, PackageInfo(version=version))
@@ -79,6 +115,7 @@ def install_lovelace_release_dependency(
             is_release=True,
             type="lovelace",
             components=None,
+            asset_digests=installed_asset_digests,
         )
 
     raise ArtifactNotFoundException()
@@ -88,6 +125,7 @@ def install_lovelace_dependency(
     config_root_path: str,
     dependency: Dependency,
     cloned_path: str,
+    version: Optional[str] = None,
 ) -> LockedDependency:
     hacs_json_path = os.path.join(cloned_path, "hacs.json")
     source_artifacts = []
@@ -124,12 +162,12 @@ def install_lovelace_dependency(
             )
             shutil.copy(artifact, artifact_destination_path)
 
-        describe_result = subprocess.run(
-            ["git", "describe", "--always"], cwd=cloned_path, stdout=subprocess.PIPE
+        if version is None:
+            version = get_source_version(cloned_path)
+        commit = get_source_commit(cloned_path)
+        write_package_info(
+            destination_path, PackageInfo(version=version, commit=commit)
         )
-        version = describe_result.stdout.decode("utf-8").strip()
-        with open(os.path.join(destination_path, ".hass-deps"), "w") as f:
-            json.dump({"version": version}, f)
 
         return LockedDependency(
             source=dependency.source,
@@ -137,6 +175,7 @@ def install_lovelace_dependency(
             is_release=False,
             type="lovelace",
             components=None,
+            commit=commit,
         )
 
     # No source candidates found, try check Github Releases.
@@ -1,2 +1,10 @@
 class ArtifactNotFoundException(Exception):
     pass
+
+
+class ArtifactDigestMismatchException(Exception):
+    pass
+
+
+class SourceCommitMismatchException(Exception):
+    pass
@@ -1,5 +1,6 @@
 import glob
 import os
+import shutil
 import subprocess
 import tempfile
 from typing import List, Optional, Any
@@ -21,10 +22,58 @@ def find_source_artifacts(
     return artifacts
 
 
+def get_source_version(cloned_path: str) -> str:
+    describe_result = subprocess.run(
+        ["git", "describe", "--always"], cwd=cloned_path, stdout=subprocess.PIPE
+    )
+    return describe_result.stdout.decode("utf-8").strip()
+
+
+def get_source_commit(cloned_path: str) -> str:
+    rev_parse_result = subprocess.run(
+        ["git", "rev-parse", "HEAD"], cwd=cloned_path, stdout=subprocess.PIPE
+    )
+    return rev_parse_result.stdout.decode("utf-8").strip()
+
+
+def fetch_source_commit(source: str, commit: str, cloned_path: str) -> bool:
+    subprocess.run(
+        ["git", "init"],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        cwd=cloned_path,
+    )
+    fetch_result = subprocess.run(
+        ["git", "fetch", "--depth", "1", source, commit],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        cwd=cloned_path,
+    )
+    if fetch_result.returncode != 0:
+        # Remote doesn't allow fetching an arbitrary commit.
+        shutil.rmtree(os.path.join(cloned_path, ".git"))
+        return False
+
+    subprocess.run(
+        ["git", "checkout", "FETCH_HEAD"],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        cwd=cloned_path,
+    )
+    return True
+
+
 def checkout_dependency_source(
-    dependency: Dependency, ref: Optional[str] = None
+    dependency: Dependency, ref: Optional[str] = None, commit: Optional[str] = None
 ) -> tempfile.TemporaryDirectory[Any]:
     tmpdir = tempfile.TemporaryDirectory(suffix="-" + dependency.get_name())
+    if commit is not None:
+        if fetch_source_commit(dependency.source, commit, tmpdir.name):
+            return tmpdir
+
+        # Fall back to checking out the exact commit from a full clone.
+        ref = commit
+
     subprocess.run(
         ["git", "clone", dependency.source, tmpdir.name],
         stdout=subprocess.DEVNULL,
@@ -0,0 +1,179 @@
+import os
+import time
+from collections import OrderedDict
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+import click
+
+from .dependency import (
+    Dependency,
+    LockedDependency,
+    load_dependencies,
+    load_locked_dependencies,
+    write_locked_dependencies,
+)
+from .deps import get_updated_lock_info, sync_dependency
+
+# (mtime, size) of a watched file, or None if the file does not exist
+FileStat = Optional[Tuple[int, int]]
+
+# Dependency config and lock entry that were last reconciled, keyed by source
+ReconciledState = Dict[str, Tuple[Dependency, Optional[LockedDependency]]]
+
+
+def get_file_stat(path: str) -> FileStat:
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+
+    return stat.st_mtime_ns, stat.st_size
+
+
+def load_locked_dependencies_if_exists(
+    path: str,
+) -> OrderedDict[str, LockedDependency]:
+    if not os.path.exists(path):
+        return OrderedDict()
+
+    return load_locked_dependencies(path)
+
+
+def get_changed_dependencies(
+    reconciled: ReconciledState,
+    dependencies: OrderedDict[str, Dependency],
+    locked_dependencies: OrderedDict[str, LockedDependency],
+) -> List[str]:
+    changed = []
+    for source, dependency in dependencies.items():
+        if reconciled.get(source) != (dependency, locked_dependencies.get(source)):
+            changed.append(source)
+
+    return changed
+
+
+def reconcile_dependencies(
+    config_dir: str,
+    sources: List[str],
+    dependencies: OrderedDict[str, Dependency],
+    locked_dependencies: OrderedDict[str, LockedDependency],
+    reconciled: ReconciledState,
+) -> List[str]:
+    """Install the given dependencies, recording each success in `reconciled`.
+
+    Returns the sources which were added to or updated in `locked_dependencies`.
+    """
+    locked_sources = []
+
+    for source in sources:
+        dependency = dependencies[source]
+        # Config changes aren't caught by the installed version check.
+        previous = reconciled.get(source)
+        force = previous is not None and previous[0] != dependency
+        try:
+            if sync_dependency(
+                config_dir, dependency, locked_dependencies, force=force
+            ):
+                locked_sources.append(source)
+        except Exception as e:
+            # Keep watching; the dependency is retried on the next change.
+            click.echo(
+                click.style(f"Failed to install {dependency.get_name()}: {e}", fg="red")
+            )
+            continue
+
+        reconciled[source] = (dependency, locked_dependencies[source])
+
+    return locked_sources
+
+
+def write_reconciled_locked_dependencies(
+    path: str,
+    locked_dependencies: OrderedDict[str, LockedDependency],
+    locked_sources: List[str],
+    loaded_stat: FileStat,
+) -> bool:
+    """Write newly locked dependencies without clobbering external lock changes.
+
+    If the lock file changed since it was loaded, the newly locked and updated
+    entries are merged into its latest contents instead. Returns whether the lock
+    file was changed externally and so still needs to be reconciled.
+    """
+    if get_file_stat(path) == loaded_stat:
+        write_locked_dependencies(path, locked_dependencies)
+        return False
+
+    latest_locked_dependencies = load_locked_dependencies_if_exists(path)
+    for source in locked_sources:
+        if source not in latest_locked_dependencies:
+            latest_locked_dependencies[source] = locked_dependencies[source]
+            continue
+
+        updated_lock_info = get_updated_lock_info(
+            latest_locked_dependencies[source], locked_dependencies[source]
+        )
+        if updated_lock_info is not None:
+            latest_locked_dependencies[source] = updated_lock_info
+
+    write_locked_dependencies(path, latest_locked_dependencies)
+    return True
+
+
+class WatchState(NamedTuple):
+    # Stats of the dependencies and lock files when they were last loaded
+    stats: Tuple[FileStat, FileStat]
+    reconciled: ReconciledState
+
+
+def poll_dependencies(
+    config_dir: str,
+    dependencies_path: str,
+    dependencies_lock_path: str,
+    state: WatchState,
+) -> WatchState:
+    """Reconcile dependencies if the dependencies or lock file changed."""
+    stats = (
+        get_file_stat(dependencies_path),
+        get_file_stat(dependencies_lock_path),
+    )
+    if stats == state.stats:
+        return state
+
+    try:
+        dependencies = load_dependencies(dependencies_path)
+        locked_dependencies = load_locked_dependencies_if_exists(dependencies_lock_path)
+    except Exception as e:
+        # Likely a partially written file, wait for the next change.
+        click.echo(click.style(f"Failed to load dependencies: {e}", fg="red"))
+        return state._replace(stats=stats)
+
+    reconciled = {
+        source: value
+        for source, value in state.reconciled.items()
+        if source in dependencies
+    }
+    changed = get_changed_dependencies(reconciled, dependencies, locked_dependencies)
+    locked_sources = reconcile_dependencies(
+        config_dir, changed, dependencies, locked_dependencies, reconciled
+    )
+    if locked_sources and not write_reconciled_locked_dependencies(
+        dependencies_lock_path, locked_dependencies, locked_sources, stats[1]
+    ):
+        # Don't treat our own write as an external change
+        stats = (stats[0], get_file_stat(dependencies_lock_path))
+
+    return WatchState(stats=stats, reconciled=reconciled)
+
+
+def watch_dependencies(
+    config_dir: str,
+    dependencies_path: str,
+    dependencies_lock_path: str,
+    interval: float,
+) -> None:
+    state = WatchState(stats=(None, None), reconciled={})
+    while True:
+        state = poll_dependencies(
+            config_dir, dependencies_path, dependencies_lock_path, state
+        )
+        time.sleep(interval)
@@ -0,0 +1,81 @@
+import os
+import subprocess
+from typing import Callable, Dict, List, Optional
+
+import pytest
+
+from hass_deps.dependency import Dependency, LockedDependency
+
+MakeGitRepo = Callable[[str, Dict[str, str]], str]
+CommitFiles = Callable[[str, Dict[str, str]], str]
+
+
+def git(cwd: str, *args: str) -> str:
+    result = subprocess.run(
+        ["git", "-c", "user.name=test", "-c", "user.email=test@example.com", *args],
+        cwd=cwd,
+        stdout=subprocess.PIPE,
+        check=True,
+    )
+    return result.stdout.decode("utf-8").strip()
+
+
+def make_dependency(source: str) -> Dependency:
+    return Dependency(
+        source=source, assets=None, root_is_custom_components=False, include=None
+    )
+
+
+def make_locked_dependency(
+    source: str,
+    version: str,
+    commit: Optional[str] = None,
+    components: Optional[List[str]] = None,
+) -> LockedDependency:
+    return LockedDependency(
+        source=source,
+        version=version,
+        is_release=False,
+        type="core",
+        components=components if components is not None else ["component"],
+        commit=commit,
+    )
+
+
+@pytest.fixture
+def config_dir(tmp_path: str) -> str:
+    path = os.path.join(tmp_path, "config")
+    os.mkdir(path)
+    return path
+
+
+@pytest.fixture
+def commit_files() -> CommitFiles:
+    """Write files into a local git repository and commit them, returning the SHA."""
+
+    def commit_files_(repo_path: str, files: Dict[str, str]) -> str:
+        for name, content in files.items():
+            path = os.path.join(repo_path, name)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "w") as f:
+                f.write(content)
+
+        git(repo_path, "add", ".")
+        git(repo_path, "commit", "-q", "-m", "Update")
+        return git(repo_path, "rev-parse", "HEAD")
+
+    return commit_files_
+
+
+@pytest.fixture
+def make_git_repo(tmp_path: str, commit_files: CommitFiles) -> MakeGitRepo:
+    """Create a local git repository with an initial commit, returning its path."""
+
+    def make_git_repo_(name: str, files: Dict[str, str]) -> str:
+        repo_path = os.path.join(tmp_path, name)
+        os.mkdir(repo_path)
+        git(repo_path, "init", "-q")
+        commit_files(repo_path, files)
+        return repo_path
+
+    return make_git_repo_
@@ -0,0 +1,81 @@
+import os
+from collections import OrderedDict
+
+from hass_deps.dependency import (
+    LockedDependency,
+    PackageInfo,
+    load_locked_dependencies,
+    load_package_info,
+    write_locked_dependencies,
+    write_package_info,
+)
+
+FIXTURES_PATH = os.path.join(os.path.dirname(__file__), "fixtures")
+
+
+def test_locked_dependencies_round_trip(tmp_path: str) -> None:
+    path = os.path.join(tmp_path, "hass-deps.lock")
+    locked_dependencies = OrderedDict(
+        [
+            (
+                "https://github.com/example/core.git",
+                LockedDependency(
+                    source="https://github.com/example/core.git",
+                    version="v1.2.0-3-gabc1234",
+                    is_release=False,
+                    type="core",
+                    components=["example"],
+                    commit="abc1234" + "0" * 33,
+                ),
+            ),
+            (
+                "https://github.com/example/card.git",
+                LockedDependency(
+                    source="https://github.com/example/card.git",
+                    version="v1.6.4",
+                    is_release=True,
+                    type="lovelace",
+                    components=None,
+                    asset_digests={"card.js": "sha256:" + "1" * 64},
+                ),
+            ),
+        ]
+    )
+
+    write_locked_dependencies(path, locked_dependencies)
+
+    assert load_locked_dependencies(path) == locked_dependencies
+
+
+def test_load_legacy_locked_dependencies() -> None:
+    locked_dependencies = load_locked_dependencies(
+        os.path.join(FIXTURES_PATH, "demo-config/hass-deps.lock")
+    )
+
+    assert len(locked_dependencies) == 14
+    assert locked_dependencies[
+        "https://github.com/nickw444/deebot-t8-hass.git"
+    ] == LockedDependency(
+        source="https://github.com/nickw444/deebot-t8-hass.git",
+        version="4ae636b",
+        is_release=False,
+        type="core",
+        components=["deebot_t8"],
+    )
+    assert locked_dependencies[
+        "https://github.com/kalkih/mini-media-player.git"
+    ] == LockedDependency(
+        source="https://github.com/kalkih/mini-media-player.git",
+        version="v1.12.1",
+        is_release=True,
+        type="lovelace",
+        components=None,
+    )
+
+
+def test_package_info_round_trip(tmp_path: str) -> None:
+    write_package_info(tmp_path, PackageInfo(version="v1.0.0", commit="abc"))
+    assert load_package_info(tmp_path) == PackageInfo(version="v1.0.0", commit="abc")
+
+    write_package_info(tmp_path, PackageInfo(version="v1.0.0"))
+    assert load_package_info(tmp_path) == PackageInfo(version="v1.0.0", commit=None)
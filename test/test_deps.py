@@ -0,0 +1,139 @@
+import json
+import os
+import shutil
+from collections import OrderedDict
+from typing import Optional
+
+import pytest
+
+from conftest import (
+    CommitFiles,
+    MakeGitRepo,
+    git,
+    make_dependency,
+    make_locked_dependency,
+)
+from hass_deps.dependency import LockedDependency, PackageInfo
+from hass_deps.deps import (
+    get_updated_lock_info,
+    install_dependency,
+    is_package_up_to_date,
+    sync_dependency,
+)
+from hass_deps.exceptions import SourceCommitMismatchException
+
+SOURCE = "https://github.com/example/core.git"
+
+
+@pytest.mark.parametrize(
+    "package_info,lock_info,expected",
+    [
+        (None, make_locked_dependency(SOURCE, "v1", None), False),
+        (PackageInfo(version="v1"), make_locked_dependency(SOURCE, "v1", None), True),
+        (PackageInfo(version="v1"), make_locked_dependency(SOURCE, "v2", None), False),
+        # Legacy package info without a commit must be reinstalled
+        (PackageInfo(version="v1"), make_locked_dependency(SOURCE, "v1", "abc"), False),
+        (
+            PackageInfo(version="abc", commit="abc"),
+            make_locked_dependency(SOURCE, "v1", "abc"),
+            True,
+        ),
+        (
+            PackageInfo(version="v1", commit="abc"),
+            make_locked_dependency(SOURCE, "v1", "def"),
+            False,
+        ),
+    ],
+)
+def test_is_package_up_to_date(
+    package_info: Optional[PackageInfo], lock_info: LockedDependency, expected: bool
+) -> None:
+    assert is_package_up_to_date(package_info, lock_info) == expected
+
+
+def test_install_dependency_keeps_locked_version(
+    config_dir: str, make_git_repo: MakeGitRepo, commit_files: CommitFiles
+) -> None:
+    repo = make_git_repo("comp-a", {"custom_components/comp_a/__init__.py": ""})
+    git(repo, "tag", "-a", "v1.0.0", "-m", "v1.0.0")
+    commit = commit_files(repo, {"custom_components/comp_a/new.py": ""})
+    dependency = make_dependency(repo)
+
+    lock_info = install_dependency(config_dir, dependency, None)
+    assert lock_info.version == f"v1.0.0-1-g{commit[:7]}"
+    assert lock_info.commit == commit
+
+    # Reinstall from the lock, which fetches only the locked commit.
+    installed_path = os.path.join(config_dir, "custom_components/comp_a")
+    shutil.rmtree(installed_path)
+    rv = install_dependency(config_dir, dependency, lock_info)
+
+    assert rv.version == lock_info.version
+    assert rv.commit == commit
+    with open(os.path.join(installed_path, ".hass-deps")) as f:
+        assert json.load(f) == {"version": lock_info.version, "commit": commit}
+
+
+def test_install_dependency_rejects_unavailable_locked_commit(
+    config_dir: str, make_git_repo: MakeGitRepo
+) -> None:
+    repo = make_git_repo("comp-a", {"custom_components/comp_a/__init__.py": ""})
+    lock_info = make_locked_dependency(repo, "v1.0.0", "0" * 40, components=["comp_a"])
+
+    with pytest.raises(SourceCommitMismatchException):
+        install_dependency(config_dir, make_dependency(repo), lock_info)
+
+    assert not os.path.exists(os.path.join(config_dir, "custom_components/comp_a"))
+
+
+def test_install_dependency_legacy_lock_uses_checked_out_version(
+    config_dir: str, make_git_repo: MakeGitRepo
+) -> None:
+    repo = make_git_repo("comp-a", {"custom_components/comp_a/__init__.py": ""})
+    commit = git(repo, "rev-parse", "HEAD")
+    # Legacy lock without a commit, whose version can't be checked out.
+    lock_info = make_locked_dependency(repo, "v9.9.9", components=["comp_a"])
+
+    rv = install_dependency(config_dir, make_dependency(repo), lock_info)
+
+    assert rv.version == commit[:7]
+    assert rv.commit == commit
+
+
+def test_get_updated_lock_info() -> None:
+    lock_info = make_locked_dependency(SOURCE, "v1")
+    resolved = make_locked_dependency(SOURCE, "v1", "abc", components=["other"])
+
+    assert get_updated_lock_info(lock_info, resolved) == lock_info._replace(
+        commit="abc", components=["other"]
+    )
+    assert get_updated_lock_info(lock_info, resolved._replace(version="v2")) is None
+    assert get_updated_lock_info(resolved, resolved._replace(commit="def")) is None
+
+
+def test_sync_dependency_backfills_legacy_lock(
+    config_dir: str, make_git_repo: MakeGitRepo, commit_files: CommitFiles
+) -> None:
+    repo = make_git_repo("comp-a", {"custom_components/comp_a/__init__.py": ""})
+    git(repo, "tag", "-a", "v1.0.0", "-m", "v1.0.0")
+    commit = git(repo, "rev-parse", "HEAD")
+    commit_files(repo, {"custom_components/comp_a/new.py": ""})
+    lock_info = make_locked_dependency(repo, "v1.0.0", components=["comp_a"])
+    locked_dependencies = OrderedDict([(repo, lock_info)])
+
+    assert sync_dependency(config_dir, make_dependency(repo), locked_dependencies)
+    assert locked_dependencies[repo] == lock_info._replace(commit=commit)
+
+    # Already installed at the locked commit, nothing further to record.
+    assert not sync_dependency(config_dir, make_dependency(repo), locked_dependencies)
+
+
+def test_sync_dependency_does_not_backfill_other_version(
+    config_dir: str, make_git_repo: MakeGitRepo
+) -> None:
+    repo = make_git_repo("comp-a", {"custom_components/comp_a/__init__.py": ""})
+    lock_info = make_locked_dependency(repo, "v9.9.9", components=["comp_a"])
+    locked_dependencies = OrderedDict([(repo, lock_info)])
+
+    assert not sync_dependency(config_dir, make_dependency(repo), locked_dependencies)
+    assert locked_dependencies[repo] == lock_info
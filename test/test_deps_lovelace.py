@@ -0,0 +1,116 @@
+import os
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+import pytest
+
+from conftest import make_dependency
+from hass_deps import deps_lovelace
+from hass_deps.dependency import Dependency, LockedDependency
+from hass_deps.deps import sync_dependency
+from hass_deps.deps_lovelace import (
+    get_content_digest,
+    install_lovelace_release_dependency,
+    is_lovelace_release_installed,
+)
+from hass_deps.exceptions import ArtifactDigestMismatchException
+
+DEPENDENCY = make_dependency("https://github.com/example/card.git")
+ASSET_URL = "https://github.com/example/card/releases/download/v1.0.0/"
+
+
+class FakeResponse:
+    def __init__(self, content: bytes) -> None:
+        self.content = content
+
+    def raise_for_status(self) -> None:
+        pass
+
+
+@pytest.fixture
+def release_assets(monkeypatch: pytest.MonkeyPatch) -> Dict[str, bytes]:
+    """Serve a fake Github release whose assets are the returned dict."""
+    assets: Dict[str, bytes] = {}
+
+    def get_github_release(
+        dependency: Dependency, tag_name: Optional[str]
+    ) -> Dict[str, Any]:
+        return {
+            "tag_name": "v1.0.0",
+            "assets": [
+                {"name": name, "browser_download_url": ASSET_URL + name}
+                for name in assets
+            ],
+        }
+
+    def get(url: str) -> FakeResponse:
+        return FakeResponse(assets[url.replace(ASSET_URL, "")])
+
+    monkeypatch.setattr(deps_lovelace, "get_github_release", get_github_release)
+    monkeypatch.setattr(deps_lovelace.requests, "get", get)
+    return assets
+
+
+def test_install_release_locks_asset_digests(
+    config_dir: str, release_assets: Dict[str, bytes]
+) -> None:
+    release_assets["card.js"] = b"card"
+
+    lock_info = install_lovelace_release_dependency(config_dir, DEPENDENCY, None)
+
+    installed_path = os.path.join(config_dir, "www/community/card")
+    assert lock_info.asset_digests == {"card.js": get_content_digest(b"card")}
+    assert is_lovelace_release_installed(installed_path, lock_info.asset_digests)
+
+    with open(os.path.join(installed_path, "card.js"), "wb") as f:
+        f.write(b"modified")
+    assert not is_lovelace_release_installed(installed_path, lock_info.asset_digests)
+
+
+@pytest.mark.parametrize(
+    "assets",
+    [
+        {"card.js": b"tampered"},
+        {"card.js": b"card", "extra.js": b"extra"},
+        {"card.js.map": b"map"},
+    ],
+)
+def test_install_release_digest_mismatch_keeps_existing_install(
+    config_dir: str, release_assets: Dict[str, bytes], assets: Dict[str, bytes]
+) -> None:
+    release_assets["card.js"] = b"card"
+    lock_info = install_lovelace_release_dependency(config_dir, DEPENDENCY, None)
+
+    release_assets.clear()
+    release_assets.update(assets)
+    with pytest.raises(ArtifactDigestMismatchException):
+        install_lovelace_release_dependency(
+            config_dir,
+            DEPENDENCY,
+            lock_info.version,
+            asset_digests=lock_info.asset_digests,
+        )
+
+    installed_path = os.path.join(config_dir, "www/community/card")
+    assert sorted(os.listdir(installed_path)) == [".hass-deps", "card.js"]
+    with open(os.path.join(installed_path, "card.js"), "rb") as f:
+        assert f.read() == b"card"
+
+
+def test_sync_release_backfills_asset_digests(
+    config_dir: str, release_assets: Dict[str, bytes]
+) -> None:
+    release_assets["card.js"] = b"card"
+    lock_info = LockedDependency(
+        source=DEPENDENCY.source,
+        version="v1.0.0",
+        is_release=True,
+        type="lovelace",
+        components=None,
+    )
+    locked_dependencies = OrderedDict([(DEPENDENCY.source, lock_info)])
+
+    assert sync_dependency(config_dir, DEPENDENCY, locked_dependencies)
+    assert locked_dependencies[DEPENDENCY.source] == lock_info._replace(
+        asset_digests={"card.js": get_content_digest(b"card")}
+    )
@@ -0,0 +1,37 @@
+import os
+import pytest
+
+from conftest import CommitFiles, MakeGitRepo, git, make_dependency
+from hass_deps.source import checkout_dependency_source, get_source_commit
+
+
+def test_checkout_dependency_source_fetches_commit(
+    make_git_repo: MakeGitRepo, commit_files: CommitFiles
+) -> None:
+    repo = make_git_repo("repo", {"a.txt": "a"})
+    commit = git(repo, "rev-parse", "HEAD")
+    commit_files(repo, {"b.txt": "b"})
+
+    with checkout_dependency_source(make_dependency(repo), commit=commit) as path:
+        assert get_source_commit(path) == commit
+        assert os.path.exists(os.path.join(path, ".git/shallow"))
+        assert not os.path.exists(os.path.join(path, "b.txt"))
+
+
+def test_checkout_dependency_source_falls_back_to_clone(
+    make_git_repo: MakeGitRepo,
+    commit_files: CommitFiles,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    repo = make_git_repo("repo", {"a.txt": "a"})
+    commit = git(repo, "rev-parse", "HEAD")
+    commit_files(repo, {"b.txt": "b"})
+    # Protocol v0 disallows fetching commits which aren't advertised as refs.
+    monkeypatch.setenv("GIT_CONFIG_COUNT", "1")
+    monkeypatch.setenv("GIT_CONFIG_KEY_0", "protocol.version")
+    monkeypatch.setenv("GIT_CONFIG_VALUE_0", "0")
+
+    with checkout_dependency_source(make_dependency(repo), commit=commit) as path:
+        assert get_source_commit(path) == commit
+        assert not os.path.exists(os.path.join(path, ".git/shallow"))
+        assert not os.path.exists(os.path.join(path, "b.txt"))
@@ -0,0 +1,438 @@
+import os
+from collections import OrderedDict
+from typing import List
+
+import pytest
+from click.testing import CliRunner
+
+from conftest import (
+    CommitFiles,
+    MakeGitRepo,
+    git,
+    make_dependency,
+    make_locked_dependency,
+)
+from hass_deps import deps
+from hass_deps.__main__ import cli
+from hass_deps.dependency import (
+    Dependency,
+    LockedDependency,
+    load_locked_dependencies,
+    write_dependencies,
+    write_locked_dependencies,
+)
+from hass_deps.watch import (
+    ReconciledState,
+    get_changed_dependencies,
+    WatchState,
+    get_file_stat,
+    poll_dependencies,
+    reconcile_dependencies,
+    write_reconciled_locked_dependencies,
+)
+
+
+@pytest.fixture
+def installed_sources(monkeypatch: pytest.MonkeyPatch) -> List[str]:
+    """Record the source of every dependency passed to install_dependency."""
+    sources = []
+    install_dependency = deps.install_dependency
+
+    def install_dependency_(
+        config_root_path: str, dependency: Dependency, *args: object, **kwargs: object
+    ) -> LockedDependency:
+        sources.append(dependency.source)
+        return install_dependency(config_root_path, dependency, *args, **kwargs)
+
+    monkeypatch.setattr(deps, "install_dependency", install_dependency_)
+    return sources
+
+
+def test_get_changed_dependencies() -> None:
+    unchanged = make_dependency("https://example.com/unchanged.git")
+    relocked = make_dependency("https://example.com/relocked.git")
+    added = make_dependency("https://example.com/added.git")
+    reconciled: ReconciledState = {
+        unchanged.source: (unchanged, make_locked_dependency(unchanged.source, "a")),
+        relocked.source: (relocked, make_locked_dependency(relocked.source, "b")),
+    }
+
+    changed = get_changed_dependencies(
+        reconciled,
+        OrderedDict((d.source, d) for d in (unchanged, relocked, added)),
+        OrderedDict(
+            [
+                (unchanged.source, make_locked_dependency(unchanged.source, "a")),
+                (relocked.source, make_locked_dependency(relocked.source, "c")),
+            ]
+        ),
+    )
+
+    assert changed == [relocked.source, added.source]
+
+
+def test_get_changed_dependencies_config_changed() -> None:
+    dependency = make_dependency("https://example.com/dep.git")
+    lock_info = make_locked_dependency(dependency.source, "a")
+    reconciled: ReconciledState = {dependency.source: (dependency, lock_info)}
+
+    changed = get_changed_dependencies(
+        reconciled,
+        OrderedDict([(dependency.source, dependency._replace(include=["other"]))]),
+        OrderedDict([(dependency.source, lock_info)]),
+    )
+
+    assert changed == [dependency.source]
+
+
+def test_reconcile_installs_new_dependency(
+    config_dir: str, make_git_repo: MakeGitRepo
+) -> None:
+    repo = make_git_repo("comp-a", {"custom_components/comp_a/__init__.py": ""})
+    dependencies = OrderedDict([(repo, make_dependency(repo))])
+    locked_dependencies: OrderedDict[str, LockedDependency] = OrderedDict()
+    reconciled: ReconciledState = {}
+
+    locked_sources = reconcile_dependencies(
+        config_dir, [repo], dependencies, locked_dependencies, reconciled
+    )
+
+    assert locked_sources == [repo]
+    assert locked_dependencies[repo].commit == git(repo, "rev-parse", "HEAD")
+    assert locked_dependencies[repo].components == ["comp_a"]
+    assert reconciled[repo] == (dependencies[repo], locked_dependencies[repo])
+    assert os.path.exists(
+        os.path.join(config_dir, "custom_components/comp_a/__init__.py")
+    )
+    assert get_changed_dependencies(reconciled, dependencies, locked_dependencies) == []
+
+
+def test_reconcile_changed_lock_reinstalls_only_changed_entry(
+    config_dir: str,
+    make_git_repo: MakeGitRepo,
+    commit_files: CommitFiles,
+    installed_sources: List[str],
+) -> None:
+    repo_a = make_git_repo("comp-a", {"custom_components/comp_a/__init__.py": ""})
+    repo_b = make_git_repo("comp-b", {"custom_components/comp_b/__init__.py": ""})
+    dependencies = OrderedDict((r, make_dependency(r)) for r in (repo_a, repo_b))
+    locked_dependencies: OrderedDict[str, LockedDependency] = OrderedDict()
+    reconciled: ReconciledState = {}
+    reconcile_dependencies(
+        config_dir, [repo_a, repo_b], dependencies, locked_dependencies, reconciled
+    )
+    installed_sources.clear()
+
+    commit = commit_files(repo_a, {"custom_components/comp_a/new.py": ""})
+    locked_dependencies[repo_a] = locked_dependencies[repo_a]._replace(
+        version=git(repo_a, "describe", "--always"), commit=commit
+    )
+    changed = get_changed_dependencies(reconciled, dependencies, locked_dependencies)
+    locked_sources = reconcile_dependencies(
+        config_dir, changed, dependencies, locked_dependencies, reconciled
+    )
+
+    assert changed == [repo_a]
+    assert installed_sources == [repo_a]
+    assert locked_sources == []
+    assert os.path.exists(os.path.join(config_dir, "custom_components/comp_a/new.py"))
+    assert reconciled[repo_a] == (dependencies[repo_a], locked_dependencies[repo_a])
+
+
+def test_reconcile_config_change_reinstalls(
+    config_dir: str, make_git_repo: MakeGitRepo
+) -> None:
+    repo = make_git_repo(
+        "comps",
+        {
+            "custom_components/comp_a/__init__.py": "",
+            "custom_components/comp_b/__init__.py": "",
+        },
+    )
+    dependencies = OrderedDict(
+        [(repo, make_dependency(repo)._replace(include=["comp_a"]))]
+    )
+    locked_dependencies: OrderedDict[str, LockedDependency] = OrderedDict()
+    reconciled: ReconciledState = {}
+    reconcile_dependencies(
+        config_dir, [repo], dependencies, locked_dependencies, reconciled
+    )
+    assert not os.path.exists(os.path.join(config_dir, "custom_components/comp_b"))
+
+    dependencies[repo] = dependencies[repo]._replace(include=["comp_a", "comp_b"])
+    changed = get_changed_dependencies(reconciled, dependencies, locked_dependencies)
+    locked_sources = reconcile_dependencies(
+        config_dir, changed, dependencies, locked_dependencies, reconciled
+    )
+
+    assert changed == [repo]
+    assert locked_sources == [repo]
+    assert os.path.exists(os.path.join(config_dir, "custom_components/comp_b"))
+    assert sorted(locked_dependencies[repo].components or []) == ["comp_a", "comp_b"]
+    assert get_changed_dependencies(reconciled, dependencies, locked_dependencies) == []
+
+
+def test_reconcile_retries_failed_install(
+    config_dir: str, make_git_repo: MakeGitRepo, commit_files: CommitFiles
+) -> None:
+    # Neither a core nor a lovelace dependency, so installation fails.
+    repo = make_git_repo("broken", {"README.md": ""})
+    dependencies = OrderedDict([(repo, make_dependency(repo))])
+    locked_dependencies: OrderedDict[str, LockedDependency] = OrderedDict()
+    reconciled: ReconciledState = {}
+
+    locked_sources = reconcile_dependencies(
+        config_dir, [repo], dependencies, locked_dependencies, reconciled
+    )
+
+    assert locked_sources == []
+    assert reconciled == {}
+    assert locked_dependencies == OrderedDict()
+
+    commit_files(repo, {"custom_components/fixed/__init__.py": ""})
+    changed = get_changed_dependencies(reconciled, dependencies, locked_dependencies)
+    locked_sources = reconcile_dependencies(
+        config_dir, changed, dependencies, locked_dependencies, reconciled
+    )
+
+    assert changed == [repo]
+    assert locked_sources == [repo]
+    assert repo in reconciled
+    assert os.path.exists(os.path.join(config_dir, "custom_components/fixed"))
+
+
+def test_write_reconciled_locked_dependencies(config_dir: str) -> None:
+    path = os.path.join(config_dir, "hass-deps.lock")
+    existing = make_locked_dependency("https://example.com/existing.git", "a")
+    write_locked_dependencies(path, OrderedDict([(existing.source, existing)]))
+    loaded_stat = get_file_stat(path)
+
+    added = make_locked_dependency("https://example.com/added.git", "b")
+    locked_dependencies = OrderedDict(
+        [(existing.source, existing), (added.source, added)]
+    )
+
+    assert not write_reconciled_locked_dependencies(
+        path, locked_dependencies, [added.source], loaded_stat
+    )
+    assert load_locked_dependencies(path) == locked_dependencies
+
+
+def test_write_reconciled_locked_dependencies_merges_external_change(
+    config_dir: str,
+) -> None:
+    path = os.path.join(config_dir, "hass-deps.lock")
+    existing = make_locked_dependency("https://example.com/existing.git", "a")
+    write_locked_dependencies(path, OrderedDict([(existing.source, existing)]))
+    loaded_stat = get_file_stat(path)
+
+    # Lock file is rewritten by another process while installing.
+    external = make_locked_dependency("https://example.com/external.git", "b")
+    relocked = existing._replace(version="c", commit="c")
+    write_locked_dependencies(
+        path, OrderedDict([(existing.source, relocked), (external.source, external)])
+    )
+
+    added = make_locked_dependency("https://example.com/added.git", "d")
+    assert write_reconciled_locked_dependencies(
+        path,
+        OrderedDict([(existing.source, existing), (added.source, added)]),
+        [added.source],
+        loaded_stat,
+    )
+    assert load_locked_dependencies(path) == OrderedDict(
+        [
+            (existing.source, relocked),
+            (external.source, external),
+            (added.source, added),
+        ]
+    )
+
+
+def test_write_reconciled_locked_dependencies_merges_updated_entries(
+    config_dir: str,
+) -> None:
+    path = os.path.join(config_dir, "hass-deps.lock")
+    existing = make_locked_dependency("https://example.com/existing.git", "a")
+    write_locked_dependencies(path, OrderedDict([(existing.source, existing)]))
+    loaded_stat = get_file_stat(path)
+
+    external = make_locked_dependency("https://example.com/external.git", "b")
+    write_locked_dependencies(
+        path, OrderedDict([(existing.source, existing), (external.source, external)])
+    )
+
+    backfilled = existing._replace(commit="abc")
+    assert write_reconciled_locked_dependencies(
+        path,
+        OrderedDict([(existing.source, backfilled)]),
+        [existing.source],
+        loaded_stat,
+    )
+    assert load_locked_dependencies(path) == OrderedDict(
+        [(existing.source, backfilled), (external.source, external)]
+    )
+
+
+class WatchPaths:
+    def __init__(self, config_dir: str) -> None:
+        self.config_dir = config_dir
+        self.dependencies_path = os.path.join(config_dir, "hass-deps.yaml")
+        self.dependencies_lock_path = os.path.join(config_dir, "hass-deps.lock")
+
+    def write_dependencies(self, *sources: str) -> None:
+        write_dependencies(
+            self.dependencies_path,
+            OrderedDict((source, make_dependency(source)) for source in sources),
+        )
+
+    def write_locked_dependencies(
+        self, locked_dependencies: OrderedDict[str, LockedDependency]
+    ) -> None:
+        write_locked_dependencies(self.dependencies_lock_path, locked_dependencies)
+        # Ensure the rewrite is visible even within the filesystem's mtime
+        # granularity.
+        stat = os.stat(self.dependencies_lock_path)
+        os.utime(
+            self.dependencies_lock_path,
+            ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000),
+        )
+
+    def poll(self, state: WatchState) -> WatchState:
+        return poll_dependencies(
+            self.config_dir, self.dependencies_path, self.dependencies_lock_path, state
+        )
+
+
+INITIAL_STATE = WatchState(stats=(None, None), reconciled={})
+
+
+def test_poll_installs_and_ignores_own_lock_write(
+    config_dir: str, make_git_repo: MakeGitRepo, installed_sources: List[str]
+) -> None:
+    repo = make_git_repo("comp-a", {"custom_components/comp_a/__init__.py": ""})
+    paths = WatchPaths(config_dir)
+    paths.write_dependencies(repo)
+
+    state = paths.poll(INITIAL_STATE)
+
+    assert installed_sources == [repo]
+    assert list(load_locked_dependencies(paths.dependencies_lock_path)) == [repo]
+    assert state.stats == (
+        get_file_stat(paths.dependencies_path),
+        get_file_stat(paths.dependencies_lock_path),
+    )
+    assert list(state.reconciled) == [repo]
+
+    assert paths.poll(state) is state
+    assert installed_sources == [repo]
+
+
+def test_poll_reconciles_external_lock_change(
+    config_dir: str,
+    make_git_repo: MakeGitRepo,
+    commit_files: CommitFiles,
+    installed_sources: List[str],
+) -> None:
+    repo_a = make_git_repo("comp-a", {"custom_components/comp_a/__init__.py": ""})
+    repo_b = make_git_repo("comp-b", {"custom_components/comp_b/__init__.py": ""})
+    paths = WatchPaths(config_dir)
+    paths.write_dependencies(repo_a, repo_b)
+    state = paths.poll(INITIAL_STATE)
+    installed_sources.clear()
+
+    commit = commit_files(repo_a, {"custom_components/comp_a/new.py": ""})
+    locked_dependencies = load_locked_dependencies(paths.dependencies_lock_path)
+    locked_dependencies[repo_a] = locked_dependencies[repo_a]._replace(
+        version=git(repo_a, "describe", "--always"), commit=commit
+    )
+    paths.write_locked_dependencies(locked_dependencies)
+    state = paths.poll(state)
+
+    assert installed_sources == [repo_a]
+    assert os.path.exists(os.path.join(config_dir, "custom_components/comp_a/new.py"))
+    assert state.reconciled[repo_a][1] == locked_dependencies[repo_a]
+
+
+def test_poll_keeps_lock_change_made_during_install(
+    config_dir: str, make_git_repo: MakeGitRepo, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    repo = make_git_repo("comp-a", {"custom_components/comp_a/__init__.py": ""})
+    paths = WatchPaths(config_dir)
+    paths.write_dependencies(repo)
+    external = make_locked_dependency("https://example.com/external.git", "a")
+    install_dependency = deps.install_dependency
+
+    def install_dependency_(
+        config_root_path: str, dependency: Dependency, *args: object, **kwargs: object
+    ) -> LockedDependency:
+        # Lock file is rewritten by another process while installing.
+        paths.write_locked_dependencies(OrderedDict([(external.source, external)]))
+        return install_dependency(config_root_path, dependency, *args, **kwargs)
+
+    monkeypatch.setattr(deps, "install_dependency", install_dependency_)
+    state = paths.poll(INITIAL_STATE)
+
+    locked_dependencies = load_locked_dependencies(paths.dependencies_lock_path)
+    assert list(locked_dependencies) == [external.source, repo]
+    # The external change is picked up on the next poll.
+    assert state.stats[1] != get_file_stat(paths.dependencies_lock_path)
+
+    monkeypatch.setattr(deps, "install_dependency", install_dependency)
+    state = paths.poll(state)
+    assert state.stats[1] == get_file_stat(paths.dependencies_lock_path)
+    assert state.reconciled[repo][1] == locked_dependencies[repo]
+
+
+def test_poll_load_error(
+    config_dir: str,
+    make_git_repo: MakeGitRepo,
+    installed_sources: List[str],
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    repo = make_git_repo("comp-a", {"custom_components/comp_a/__init__.py": ""})
+    paths = WatchPaths(config_dir)
+    with open(paths.dependencies_path, "w") as f:
+        f.write("dependencies: [")
+
+    state = paths.poll(INITIAL_STATE)
+
+    assert "Failed to load dependencies" in capsys.readouterr().out
+    assert state.stats[0] == get_file_stat(paths.dependencies_path)
+    assert state.reconciled == {}
+    assert paths.poll(state) is state
+
+    paths.write_dependencies(repo)
+    state = paths.poll(state)
+
+    assert installed_sources == [repo]
+    assert list(state.reconciled) == [repo]
+
+
+def test_poll_forgets_removed_dependency(
+    config_dir: str, make_git_repo: MakeGitRepo, installed_sources: List[str]
+) -> None:
+    repo_a = make_git_repo("comp-a", {"custom_components/comp_a/__init__.py": ""})
+    repo_b = make_git_repo("comp-b", {"custom_components/comp_b/__init__.py": ""})
+    paths = WatchPaths(config_dir)
+    paths.write_dependencies(repo_a, repo_b)
+    state = paths.poll(INITIAL_STATE)
+    installed_sources.clear()
+
+    paths.write_dependencies(repo_a)
+    state = paths.poll(state)
+
+    assert installed_sources == []
+    assert list(state.reconciled) == [repo_a]
+
+
+@pytest.mark.parametrize("interval", ["0", "-1"])
+def test_watch_rejects_invalid_interval(config_dir: str, interval: str) -> None:
+    with open(os.path.join(config_dir, "hass-deps.yaml"), "w") as f:
+        f.write("dependencies: []\n")
+
+    result = CliRunner().invoke(
+        cli, ["--config-dir", config_dir, "watch", "--interval", interval]
+    )
+
+    assert result.exit_code == 2